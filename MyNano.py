@@ -2,7 +2,23 @@ import curses
 import sys
 import time
 import os
-import glob
+import select
+import bisect
+import unicodedata
+from dataclasses import dataclass, field
+
+PASTE_CHUNK_SIZE = 65536  # bytes read from the terminal per paste read
+PASTE_PROGRESS_INTERVAL = 0.1  # seconds between paste progress updates
+CLOCK_WIDTH = len("HH:MM:SS")  # columns of the title bar taken by the clock
+PAD_SCREENS = 3  # height of the text pad, in screens of lines
+ACTIVE_PERIOD = 0.5  # seconds after a key press that count as active typing
+ACTIVE_TIMEOUT_MS = 50  # getch() timeout while typing
+LOAD_BLOCK_SIZE = 1 << 20  # bytes read per block when loading
+CHUNK_LINES = 1024  # lines per chunk of the document's line list
+ROW_SLACK = 16  # characters cut per row beyond its width, for combining marks
+
+# Directory listings for Tab completion: directory -> (mtime_ns, entries)
+_dir_cache = {}
 
 
 def init_colors():
@@ -12,41 +28,48 @@ def init_colors():
     curses.init_pair(1, curses.COLOR_BLUE, -1)  # directories
     curses.init_pair(2, curses.COLOR_GREEN, -1)  # executables
 
-def draw_title_bar(stdscr, filename, dirty, cursor_y, cursor_x):
-    """Draws the top title bar with time, filename, and cursor position."""
-    h, w = stdscr.getmaxyx()
-    time_str = time.strftime("%H:%M:%S")
-    title = f"{time_str} | {filename or 'Untitled'}{' *' if dirty else ''} | Ln {cursor_y + 1}, Col {cursor_x + 1}"
+def draw_clock(stdscr, time_str):
+    """Draws the HH:MM:SS clock at the left edge of the title bar."""
+    stdscr.addstr(0, 0, time_str, curses.A_REVERSE)
+
+def draw_title_bar(stdscr, w, filename, dirty, cursor_y, cursor_x):
+    """Draws the title bar after the clock: filename and cursor position."""
+    title = f" | {filename or 'Untitled'}{' *' if dirty else ''} | Ln {cursor_y + 1}, Col {cursor_x + 1}"
     
-    # Truncate title to window width
-    truncated_title = title[:w-1]
-    fill = ' ' * (w - 1 - len(truncated_title))
+    # Truncate and pad title to the window width left of the clock
+    width = w - 1 - CLOCK_WIDTH
+    line = title[:width].ljust(width)
     
-    stdscr.attron(curses.A_REVERSE)
-    stdscr.addstr(0, 0, truncated_title)
-    if fill:
-        stdscr.addstr(0, len(truncated_title), fill)
-    stdscr.attroff(curses.A_REVERSE)
+    stdscr.addstr(0, CLOCK_WIDTH, line, curses.A_REVERSE)
+
+def update_title_bar(stdscr, w, filename, dirty, cursor_y, cursor_x, shown):
+    """Redraws the title bar zones that changed since the last call.
+
+    shown is what the previous call returned, or None to draw everything.
+    The clock is only formatted when the second has changed."""
+    now = int(time.time())
+    title = (w, filename, dirty, cursor_y, cursor_x)
+    last_second, last_title = shown or (None, None)
+    if now != last_second:
+        draw_clock(stdscr, time.strftime("%H:%M:%S", time.localtime(now)))
+    if title != last_title:
+        draw_title_bar(stdscr, w, filename, dirty, cursor_y, cursor_x)
+    return now, title
 
-def draw_status_bar(stdscr, message):
+def draw_status_bar(stdscr, h, w, message):
     """Draws the bottom status bar with messages."""
-    h, w = stdscr.getmaxyx()
     if h < 2:
         return
     
-    # Truncate message to window width
-    truncated_msg = message[:w-1]
-    fill = ' ' * (w - 1 - len(truncated_msg))
+    # Truncate and pad message to window width
+    line = message[:w-1].ljust(w-1)
     
-    stdscr.attron(curses.A_REVERSE)
-    stdscr.addstr(h-1, 0, truncated_msg)
-    if fill:
-        stdscr.addstr(h-1, len(truncated_msg), fill)
-    stdscr.attroff(curses.A_REVERSE)
-
-def save_file_dialog(stdscr, filename):
-    """Opens a save dialog at the bottom for entering a filename."""
-    h, w = stdscr.getmaxyx()
+    stdscr.addstr(h-1, 0, line, curses.A_REVERSE)
+
+def save_file_dialog(stdscr, h, w, filename):
+    """Opens a save dialog at the bottom for entering a filename.
+
+    h and w are the current window size, as cached by the main loop."""
     if h < 3:
         return None
     
@@ -66,11 +89,45 @@ def save_file_dialog(stdscr, filename):
 
     return new_filename or filename
 
-def open_file_dialog(stdscr):
+def complete_path(path):
+    """Return (path, DirEntry) pairs for the entries starting with path.
+
+    Listings are cached per directory until its mtime changes. As with
+    glob, hidden entries only match a name that starts with a dot."""
+    dirname, base = os.path.split(path)
+    key = dirname or "."
+    try:
+        mtime = os.stat(key).st_mtime_ns
+        cached = _dir_cache.get(key)
+        if cached is None or cached[0] != mtime:
+            with os.scandir(key) as it:
+                cached = _dir_cache[key] = (mtime, list(it))
+    except OSError:
+        return []
+    hidden = base.startswith(".")
+    return [
+        (os.path.join(dirname, e.name), e)
+        for e in cached[1]
+        if e.name.startswith(base) and (hidden or not e.name.startswith("."))
+    ]
+
+def entry_kind(entry):
+    """Classify a DirEntry as 0 (file), 1 (directory) or 2 (executable).
+
+    DirEntry caches its stat result, so each entry costs at most one
+    stat call however often it is suggested."""
+    if entry.is_dir():
+        return 1
+    try:
+        return 2 if entry.stat().st_mode & 0o111 else 0
+    except OSError:  # e.g. a dangling symlink
+        return 0
+
+def open_file_dialog(stdscr, h, w):
     """Opens a dialog at the bottom for entering a filename to open.
 
-    Supports basic tab auto-completion using the filesystem."""
-    h, w = stdscr.getmaxyx()
+    Supports basic tab auto-completion using the filesystem. h and w are
+    the current window size; they are only re-queried on KEY_RESIZE."""
     if h < 3:
         return None
 
@@ -78,6 +135,14 @@ def open_file_dialog(stdscr):
     max_len = w - len(prompt) - 1
     path = ""
     suggestions = []
+    # The grid shows at most 5 rows of names at least 3 columns wide
+    max_suggestions = min(5, h - 3) * max(1, w // 3)
+    # Suggestion attributes by kind: file, directory, executable
+    attrs = (
+        curses.A_NORMAL,
+        curses.color_pair(1) | curses.A_BOLD,
+        curses.color_pair(2),
+    )
 
     curses.curs_set(1)
     stdscr.timeout(-1)  # wait for user input
@@ -90,13 +155,8 @@ def open_file_dialog(stdscr):
         if suggestions:
             max_lines = min(5, h - 3)
 
-            # Prepare names and compute column width
-            names = []
-            for s in suggestions:
-                n = os.path.basename(s)
-                if os.path.isdir(s):
-                    n += "/"
-                names.append(n)
+            # Compute column width
+            names = [name for name, _ in suggestions]
 
             if names:
                 col_width = min(max(len(n) for n in names) + 2, w)
@@ -108,19 +168,13 @@ def open_file_dialog(stdscr):
                     stdscr.move(ln, 0)
                     stdscr.clrtoeol()
 
-                for i, s in enumerate(suggestions[: rows * cols]):
-                    name = os.path.basename(s)
-                    attr = curses.A_NORMAL
-                    if os.path.isdir(s):
-                        name += "/"
-                        attr = curses.color_pair(1) | curses.A_BOLD
-                    elif os.access(s, os.X_OK):
-                        attr = curses.color_pair(2)
+                addstr = stdscr.addstr
+                for i, (name, kind) in enumerate(suggestions[: rows * cols]):
                     row = i % rows
                     col = i // rows
                     x = col * col_width
                     if x < w:
-                        stdscr.addstr(start_line + row, x, name[: col_width - 1], attr)
+                        addstr(start_line + row, x, name[: col_width - 1], attrs[kind])
         else:
             stdscr.move(h-3, 0)
             stdscr.clrtoeol()
@@ -132,18 +186,34 @@ def open_file_dialog(stdscr):
             break
         elif ch in (curses.KEY_BACKSPACE, "\b", "\x7f"):
             path = path[:-1]
+        elif ch == curses.KEY_RESIZE:
+            h, w = stdscr.getmaxyx()
+            if h < 3:
+                # No room left for the dialog: cancel without drawing
+                stdscr.timeout(100)
+                return None
+            max_len = w - len(prompt) - 1
+            max_suggestions = min(5, h - 3) * max(1, w // 3)
+            suggestions = suggestions[:max_suggestions]
+            stdscr.erase()  # the main loop repaints on return
         elif ch == "\t":
-            matches = glob.glob(path + "*")
+            matches = complete_path(path)
             if len(matches) == 1:
-                comp = matches[0]
-                if os.path.isdir(comp):
+                comp, entry = matches[0]
+                if entry.is_dir():
                     comp += "/"
                 path = comp
                 suggestions = []
             elif len(matches) > 1:
-                prefix = os.path.commonprefix(matches)
-                path = prefix
-                suggestions = matches
+                # All matches share the directory part, so only the names
+                # need comparing
+                prefix = os.path.commonprefix([e.name for _, e in matches])
+                path = os.path.join(os.path.dirname(path), prefix)
+                suggestions = []
+                for _, entry in matches[:max_suggestions]:
+                    kind = entry_kind(entry)
+                    name = entry.name + "/" if kind == 1 else entry.name
+                    suggestions.append((name, kind))
             else:
                 suggestions = []
         elif isinstance(ch, str) and ch.isprintable():
@@ -158,7 +228,7 @@ def open_file_dialog(stdscr):
     stdscr.timeout(100)
     return path.strip() or None
 
-def show_help(stdscr):
+def show_help(stdscr, h, w):
     """Display a simple help window with key bindings."""
     help_lines = [
         "MyNano - Key Bindings",
@@ -173,7 +243,6 @@ def show_help(stdscr):
         "Press any key to return",
     ]
 
-    h, w = stdscr.getmaxyx()
     width = min(max(len(l) for l in help_lines) + 4, w)
     height = min(len(help_lines) + 2, h)
     win = curses.newwin(height, width, (h - height) // 2, (w - width) // 2)
@@ -183,55 +252,433 @@ def show_help(stdscr):
     win.refresh()
     win.getch()
     win.clear()
-    stdscr.touchwin()
-    stdscr.refresh()
+    stdscr.touchwin()  # the main loop repaints on return
+
+class GapLine:
+    """A line of text held in a gap buffer while it is being edited.
+
+    Characters are stored UTF-32 encoded in a bytearray with a gap at the
+    last edit position, so typing or deleting at the cursor only moves the
+    gap edges instead of rebuilding the whole line string."""
+
+    CHAR = 4  # bytes per character
+
+    def __init__(self, text="", gap=64):
+        data = text.encode("utf-32-le", "surrogatepass")
+        self.data = bytearray(data) + bytearray(gap * self.CHAR)
+        self.gap_start = len(data)
+        self.gap_end = len(self.data)
+
+    def __len__(self):
+        return (len(self.data) - self.gap_end + self.gap_start) // self.CHAR
+
+    def __str__(self):
+        text = self.data[:self.gap_start] + self.data[self.gap_end:]
+        return text.decode("utf-32-le", "surrogatepass")
+
+    def head(self, n):
+        """Return the first n characters of the line.
+
+        Only those characters are copied and decoded, so showing the start
+        of a long line does not cost a pass over all of it."""
+        n *= self.CHAR
+        if n <= self.gap_start:
+            text = self.data[:n]
+        else:
+            after = self.gap_end + n - self.gap_start
+            text = self.data[:self.gap_start] + self.data[self.gap_end:after]
+        return text.decode("utf-32-le", "surrogatepass")
+
+    def _move_gap(self, pos):
+        """Move the gap so that it starts at character index pos."""
+        pos *= self.CHAR
+        if pos < self.gap_start:
+            n = self.gap_start - pos
+            self.data[self.gap_end - n:self.gap_end] = self.data[pos:self.gap_start]
+            self.gap_start -= n
+            self.gap_end -= n
+        elif pos > self.gap_start:
+            n = pos - self.gap_start
+            self.data[self.gap_start:pos] = self.data[self.gap_end:self.gap_end + n]
+            self.gap_start += n
+            self.gap_end += n
+
+    def insert(self, pos, text):
+        """Insert text before character index pos."""
+        data = text.encode("utf-32-le", "surrogatepass")
+        self._move_gap(pos)
+        if len(data) > self.gap_end - self.gap_start:
+            grow = max(len(data), len(self.data))
+            self.data[self.gap_end:self.gap_end] = bytearray(grow)
+            self.gap_end += grow
+        self.data[self.gap_start:self.gap_start + len(data)] = data
+        self.gap_start += len(data)
+
+    def delete_left(self, pos):
+        """Delete the character before character index pos."""
+        self._move_gap(pos)
+        self.gap_start -= self.CHAR
+
+    def split(self, pos):
+        """Remove and return the text before character index pos."""
+        self._move_gap(pos)
+        head = self.data[:self.gap_start].decode("utf-32-le", "surrogatepass")
+        self.gap_start = 0
+        return head
+
+def edit_line(buffer, y):
+    """Return buffer[y] as a GapLine, converting it if necessary."""
+    line = buffer[y]
+    if not isinstance(line, GapLine):
+        line = buffer[y] = GapLine(line)
+    return line
+
+def flatten_line(buffer, y):
+    """Turn a GapLine at buffer[y] back into a plain string."""
+    if y < len(buffer) and isinstance(buffer[y], GapLine):
+        buffer[y] = str(buffer[y])
+
+class RawLines:
+    """Lines of a loaded file kept as undecoded UTF-8 until first used.
+
+    data holds the lines joined by LF, without a final line break. Invalid
+    bytes decode to lone surrogates (surrogateescape), so they are written
+    back unchanged on save."""
+
+    def __init__(self, data):
+        self.data = data
+        self.count = data.count(b"\n") + 1
+
+    def __len__(self):
+        return self.count
+
+    def decode(self):
+        return self.data.decode("utf-8", "surrogateescape").split("\n")
+
+class ChunkedLines:
+    """A list of lines stored as a list of chunks of about CHUNK_LINES lines.
+
+    Inserting or removing a line only shifts the rest of its own chunk,
+    rather than every later line of the document. The chunk start offsets
+    after an edited chunk are shifted lazily: repeated edits in the same
+    chunk only add up a pending shift, which _locate() takes into account.
+    Chunks added with extend_raw() stay undecoded bytes until one of their
+    lines is read or edited. Supports the subset of the list interface the
+    editor uses."""
+
+    def __init__(self, lines=()):
+        lines = list(lines)
+        self.chunks = [
+            lines[i:i + CHUNK_LINES] for i in range(0, len(lines), CHUNK_LINES)
+        ] or [[]]
+        self._reindex()
+
+    def _reindex(self):
+        """Recompute the start offset of every chunk."""
+        self.starts = []
+        total = 0
+        for chunk in self.chunks:
+            self.starts.append(total)
+            total += len(chunk)
+        self.length = total
+        # starts[shift_from:] are shift lines behind their true values
+        self.shift_from = 0
+        self.shift = 0
+
+    def _flush_shift(self):
+        """Apply the pending shift to the chunk start offsets."""
+        if self.shift:
+            k, shift = self.shift_from, self.shift
+            self.starts[k:] = [start + shift for start in self.starts[k:]]
+            self.shift = 0
+
+    def _locate(self, i):
+        """Return (chunk index, index within chunk) for line index i.
+
+        i == len(self) maps to the end of the last chunk."""
+        starts = self.starts
+        k = self.shift_from
+        if self.shift and k < len(starts) and i >= starts[k] + self.shift:
+            c = bisect.bisect_right(starts, i - self.shift, k) - 1
+            return c, i - starts[c] - self.shift
+        c = bisect.bisect_right(starts, i, 0, k if self.shift else len(starts)) - 1
+        return c, i - starts[c]
+
+    def _index(self, i):
+        """Normalise a possibly negative line index."""
+        if i < 0:
+            i += self.length
+        if not 0 <= i < self.length:
+            raise IndexError("line index out of range")
+        return i
+
+    def _decode(self, start, stop):
+        """Decode the raw chunks holding lines start to stop, inclusive."""
+        c = self._locate(start)[0]
+        d = self._locate(stop)[0]
+        chunks = self.chunks[c:d + 1]
+        if not any(isinstance(chunk, RawLines) for chunk in chunks):
+            return
+        decoded = []
+        for chunk in chunks:
+            if isinstance(chunk, RawLines):
+                lines = chunk.decode()
+                decoded += [
+                    lines[i:i + CHUNK_LINES]
+                    for i in range(0, len(lines), CHUNK_LINES)
+                ]
+            else:
+                decoded.append(chunk)
+        self.chunks[c:d + 1] = decoded
+        self._reindex()
+
+    def _append_chunk(self, chunk):
+        """Add a non-empty chunk after the last line."""
+        self._flush_shift()
+        if not self.length:
+            self.chunks = []
+            self.starts = []
+        self.starts.append(self.length)
+        self.chunks.append(chunk)
+        self.length += len(chunk)
+
+    def _splice(self, start, stop, lines):
+        """Replace lines start:stop with the list lines."""
+        self._decode(start, stop)
+        c, j = self._locate(start)
+        chunk = self.chunks[c]
+        if stop - start <= len(chunk) - j:
+            chunk[j:j + stop - start] = lines
+            delta = len(lines) - (stop - start)
+            if len(chunk) > 2 * CHUNK_LINES or (not chunk and len(self.chunks) > 1):
+                # Split an oversized chunk, or drop an empty one
+                self.chunks[c:c + 1] = [
+                    chunk[i:i + CHUNK_LINES]
+                    for i in range(0, len(chunk), CHUNK_LINES)
+                ]
+                self._reindex()
+            elif delta:
+                if self.shift and self.shift_from != c + 1:
+                    self._flush_shift()
+                self.shift_from = c + 1
+                self.shift += delta
+                self.length += delta
+        else:
+            # The range spans chunks: rebuild the chunks it touches
+            d, k = self._locate(stop)
+            lines = chunk[:j] + lines + self.chunks[d][k:]
+            self.chunks[c:d + 1] = [
+                lines[i:i + CHUNK_LINES] for i in range(0, len(lines), CHUNK_LINES)
+            ]
+            if not self.chunks:
+                self.chunks.append([])
+            self._reindex()
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            yield from chunk.decode() if isinstance(chunk, RawLines) else chunk
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self.length)
+            if step != 1:
+                return list(self)[i]
+            if start >= stop:
+                return []
+            self._decode(start, stop - 1)
+            result = []
+            while start < stop:
+                c, j = self._locate(start)
+                part = self.chunks[c][j:j + stop - start]
+                result += part
+                start += len(part)
+            return result
+        i = self._index(i)
+        c, j = self._locate(i)
+        if isinstance(self.chunks[c], RawLines):
+            self._decode(i, i)
+            c, j = self._locate(i)
+        return self.chunks[c][j]
+
+    def __setitem__(self, i, value):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self.length)
+            if step != 1:
+                raise ValueError("extended slices are not supported")
+            self._splice(start, max(start, stop), list(value))
+        else:
+            i = self._index(i)
+            self._decode(i, i)
+            c, j = self._locate(i)
+            self.chunks[c][j] = value
+
+    def insert(self, i, line):
+        start = max(0, min(i + self.length if i < 0 else i, self.length))
+        self._splice(start, start, [line])
+
+    def pop(self, i=-1):
+        i = self._index(i)
+        line = self[i]
+        self._splice(i, i + 1, [])
+        return line
+
+    def extend(self, lines):
+        lines = list(lines)
+        for i in range(0, len(lines), CHUNK_LINES):
+            self._append_chunk(lines[i:i + CHUNK_LINES])
+
+    def extend_raw(self, data):
+        """Append lines given as UTF-8 bytes joined by LF (no CR), without
+        a final line break; they are only decoded when first used."""
+        self._append_chunk(RawLines(data))
+
+    def encoded_chunks(self):
+        """Yield each chunk's lines as UTF-8 bytes joined by LF.
+
+        Chunks that were never decoded are passed through unchanged, and
+        bytes that were not valid UTF-8 are restored from their surrogates."""
+        for chunk in self.chunks:
+            if isinstance(chunk, RawLines):
+                yield chunk.data
+            else:
+                yield "\n".join(chunk).encode("utf-8", "surrogateescape")
+
+def fit_row(text, width):
+    """Return text as it fits in at most width screen columns.
+
+    Tabs are expanded to spaces and the text is cut by display width, not
+    by length: wide characters take two columns and curses shows control
+    characters as ^X, so otherwise a row could wrap past the pad edge.
+    Tabs and wide characters only make text wider, so only the first
+    width + ROW_SLACK characters are looked at, however long the line."""
+    text = text[:width + ROW_SLACK].expandtabs()
+    if text.isascii() and text.isprintable():
+        return text[:width]
+    cells = 0
+    for i, ch in enumerate(text):
+        if unicodedata.combining(ch):
+            n = 0
+        elif ch < " " or ch == "\x7f":
+            n = 2  # ^X
+        elif not ch.isprintable():
+            n = 4  # at most M-^X
+        elif unicodedata.east_asian_width(ch) in "WF":
+            n = 2
+        else:
+            n = 1
+        cells += n
+        if cells > width:
+            return text[:i]
+    return text
 
 def insert_text(buffer, cursor_y, cursor_x, text):
-    """Inserts pasted text safely at the cursor position."""
-    lines = text.split("\n")
+    """Inserts pasted text safely at the cursor position.
+
+    CRLF and CR line endings are turned into LF first, so the lines can be
+    cut with one memchr-backed str.split() on LF alone."""
+    if cursor_y >= len(buffer):
+        buffer.extend([""] * (cursor_y + 1 - len(buffer)))
+    current = buffer[cursor_y]
     
-    # Handle first line
-    while cursor_y >= len(buffer):
-        buffer.append("")
-    buffer[cursor_y] = buffer[cursor_y][:cursor_x] + lines[0] + buffer[cursor_y][cursor_x:]
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    if "\n" not in text:
+        buffer[cursor_y] = current[:cursor_x] + text + current[cursor_x:]
+        return cursor_y, cursor_x + len(text)
     
-    # Insert remaining lines
-    new_cursor_y = cursor_y
-    new_cursor_x = cursor_x + len(lines[0])
-    for line in lines[1:]:
-        new_cursor_y += 1
-        buffer.insert(new_cursor_y, line)
-        new_cursor_x = len(line)
+    # Splice all new lines in with a single slice assignment
+    lines = text.split("\n")
+    head = current[:cursor_x] + lines[0]
+    tail = lines[-1] + current[cursor_x:]
+    buffer[cursor_y:cursor_y + 1] = [head, *lines[1:-1], tail]
     
-    return new_cursor_y, new_cursor_x
+    return cursor_y + len(lines) - 1, len(lines[-1])
+
+def split_lines(data):
+    """Decode UTF-8 bytes and split them at LF, CRLF or CR line breaks.
+
+    Invalid bytes are kept as surrogates, as in RawLines. A final line
+    break does not start another line."""
+    text = data.decode("utf-8", "surrogateescape")
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
+def load_file(stdscr, filename):
+    """Read a file into a ChunkedLines list of lines.
+
+    The file is read in blocks of LOAD_BLOCK_SIZE bytes, each cut at its
+    last line break. Blocks with only LF line endings are stored undecoded
+    and only decoded once their lines are shown or edited; the status bar
+    shows progress after every block."""
+    h, w = stdscr.getmaxyx()
+    lines = ChunkedLines()
+    # Blocks read since the last line break; they are only joined once a
+    # block ends the line, so a very long line is not copied once per block
+    tail = []
+    with open(filename, 'rb') as f:
+        while True:
+            block = f.read(LOAD_BLOCK_SIZE)
+            if not block:
+                break
+            tail.append(block)
+            if b"\n" not in block:
+                continue
+            block = b"".join(tail)
+            cut = block.rfind(b"\n")
+            tail = [block[cut + 1:]]
+            if b"\r" in block[:cut]:
+                lines.extend(split_lines(block[:cut + 1]))
+            else:
+                lines.extend_raw(block[:cut])
+            draw_status_bar(stdscr, h, w, f"Loading... {len(lines)} lines")
+            stdscr.refresh()
+    lines.extend(split_lines(b"".join(tail)))
+    return lines if lines else ChunkedLines([""])
 
 def save_file(filename, buffer):
-    """Write the buffer to disk."""
-    with open(filename, 'w') as f:
-        f.write('\n'.join(buffer))
+    """Write the buffer to disk.
+
+    Each chunk of the ChunkedLines buffer is written as one block, so the
+    whole file is never held in memory as one string and chunks that were
+    never decoded are written back as they were read."""
+    with open(filename, 'wb') as f:
+        for i, data in enumerate(buffer.encoded_chunks()):
+            if i:
+                f.write(b"\n")  # between this chunk and the previous one
+            f.write(data)
 
-def confirm_exit(stdscr, filename, buffer, dirty):
+def confirm_exit(stdscr, h, w, filename, buffer, dirty):
     """Prompt the user about saving changes before exiting.
 
-    Returns a tuple (exit_editor, filename, dirty, message)."""
+    h and w are the current window size; they are only re-queried on
+    KEY_RESIZE. Returns a tuple (exit_editor, filename, dirty, message)."""
     if not dirty:
         return True, filename, dirty, None
 
-    h, w = stdscr.getmaxyx()
     prompt = "Save changes before exiting? (y)es/(n)o/(c)ancel: "
-
-    stdscr.addstr(h-2, 0, prompt[: w - 1])
-    stdscr.clrtoeol()
-    stdscr.refresh()
     curses.curs_set(1)
     stdscr.timeout(-1)
 
     while True:
+        stdscr.addstr(h-2, 0, prompt[: w - 1])
+        stdscr.clrtoeol()
+        stdscr.refresh()
         ch = stdscr.get_wch()
         if isinstance(ch, str):
             ch = ch.lower()
             if ch in ('y', 'n', 'c'):
                 break
+        elif ch == curses.KEY_RESIZE:
+            h, w = stdscr.getmaxyx()
+            stdscr.erase()  # the main loop repaints on return
+            if h < 3:
+                # No room left for the prompt: cancel, keeping the buffer
+                stdscr.timeout(100)
+                return False, filename, dirty, None
 
     stdscr.timeout(100)
     stdscr.move(h-2, 0)
@@ -239,7 +686,7 @@ def confirm_exit(stdscr, filename, buffer, dirty):
 
     if ch == 'y':
         if not filename:
-            new_name = save_file_dialog(stdscr, filename)
+            new_name = save_file_dialog(stdscr, h, w, filename)
             if not new_name:
                 return False, filename, dirty, None
             filename = new_name
@@ -253,197 +700,485 @@ def confirm_exit(stdscr, filename, buffer, dirty):
     else:
         return False, filename, dirty, None
 
+@dataclass
+class EditorState:
+    """Editor state shared by the main loop and the key handlers."""
+    stdscr: object
+    buffer: ChunkedLines
+    filename: str = None
+    cursor_y: int = 0
+    cursor_x: int = 0
+    scroll_offset: int = 0
+    dirty: bool = False
+    line_numbers: bool = False
+    status_message: str = ""
+    h: int = 0
+    w: int = 0
+    visible_lines: int = 0
+    dirty_lines: set = field(default_factory=set)  # lines edited in place
+    redraw_from: int = None  # lines from here on were inserted/removed
+    need_render: bool = True  # redraw the text area after this key
+    cursor_only: bool = False  # only the cursor moved, within the viewport
+    running: bool = True
+
+def handle_exit(state):
+    """Ctrl+X: offer to save, then leave the main loop."""
+    exit_now, state.filename, state.dirty, msg = confirm_exit(
+        state.stdscr, state.h, state.w, state.filename, state.buffer, state.dirty
+    )
+    if msg:
+        state.status_message = msg
+    if exit_now:
+        state.running = False
+
+def handle_save(state):
+    """Ctrl+S: save to the current file, asking for a name if there is none."""
+    if not state.filename:
+        state.filename = save_file_dialog(
+            state.stdscr, state.h, state.w, state.filename
+        )
+        if not state.filename:
+            return
+    try:
+        save_file(state.filename, state.buffer)
+        state.dirty = False
+        state.status_message = f"Saved: {state.filename}"
+    except Exception as e:
+        state.status_message = f"Save failed: {str(e)}"
+
+def handle_open(state):
+    """Ctrl+O: replace the buffer with a file picked in the open dialog."""
+    new_filename = open_file_dialog(state.stdscr, state.h, state.w)
+    if new_filename:
+        try:
+            state.buffer = load_file(state.stdscr, new_filename)
+            state.filename = new_filename
+            state.dirty = False
+            state.cursor_y = state.cursor_x = state.scroll_offset = 0
+            state.status_message = f"Opened: {state.filename}"
+        except FileNotFoundError:
+            state.status_message = "File not found."
+        except Exception as e:
+            state.status_message = f"Open failed: {str(e)}"
+
+def handle_backspace(state):
+    """Delete left of the cursor, joining lines at column 0."""
+    buffer = state.buffer
+    if state.cursor_x > 0:
+        edit_line(buffer, state.cursor_y).delete_left(state.cursor_x)
+        state.dirty_lines.add(state.cursor_y)
+        state.cursor_x -= 1
+        state.dirty = True
+    elif state.cursor_y > 0:
+        prev_len = len(buffer[state.cursor_y - 1])
+        text = str(buffer.pop(state.cursor_y))
+        edit_line(buffer, state.cursor_y - 1).insert(prev_len, text)
+        state.redraw_from = state.cursor_y - 1
+        state.cursor_y -= 1
+        state.cursor_x = prev_len
+        state.dirty = True
+
+def handle_enter(state):
+    """Split the current line at the cursor.
+
+    The text after the cursor stays in the line's gap buffer and becomes
+    the new cursor line, so typing can carry on without a conversion."""
+    buffer, y = state.buffer, state.cursor_y
+    line = edit_line(buffer, y)
+    buffer[y:y + 1] = [line.split(state.cursor_x), line]
+    state.redraw_from = y
+    state.cursor_y += 1
+    state.cursor_x = 0
+    state.dirty = True
+
+def handle_up(state):
+    if state.cursor_y > 0:
+        state.cursor_y -= 1
+        state.cursor_x = min(state.cursor_x, len(state.buffer[state.cursor_y]))
+        state.cursor_only = state.cursor_y >= state.scroll_offset
+    else:
+        state.need_render = False
+
+def handle_down(state):
+    if state.cursor_y < len(state.buffer) - 1:
+        state.cursor_y += 1
+        state.cursor_x = min(state.cursor_x, len(state.buffer[state.cursor_y]))
+        state.cursor_only = (
+            state.cursor_y < state.scroll_offset + state.visible_lines
+        )
+    else:
+        state.need_render = False
+
+def handle_left(state):
+    """Move left, wrapping to the end of the previous line."""
+    if state.cursor_x > 0:
+        state.cursor_x -= 1
+        state.cursor_only = True
+    elif state.cursor_y > 0:
+        flatten_line(state.buffer, state.cursor_y)  # leaving the line
+        state.cursor_y -= 1
+        state.cursor_x = len(state.buffer[state.cursor_y])
+        state.cursor_only = state.cursor_y >= state.scroll_offset
+    else:
+        state.need_render = False
+
+def handle_right(state):
+    """Move right, wrapping to the start of the next line."""
+    if state.cursor_x < len(state.buffer[state.cursor_y]):
+        state.cursor_x += 1
+        state.cursor_only = True
+    elif state.cursor_y < len(state.buffer) - 1:
+        flatten_line(state.buffer, state.cursor_y)  # leaving the line
+        state.cursor_y += 1
+        state.cursor_x = 0
+        state.cursor_only = (
+            state.cursor_y < state.scroll_offset + state.visible_lines
+        )
+    else:
+        state.need_render = False
+
+def handle_resize(state):
+    pass  # size is re-queried before the next redraw
+
+def handle_help(state):
+    """Ctrl+G: show the help window."""
+    show_help(state.stdscr, state.h, state.w)
+
+def handle_toggle_line_numbers(state):
+    """Ctrl+L: toggle line numbers."""
+    state.line_numbers = not state.line_numbers
+
+def handle_paste(state):
+    """Ctrl+V: read a pasted stream straight from the terminal."""
+    stdscr, h = state.stdscr, state.h
+    # Improved paste implementation: drain stdin in bulk while raw
+    curses.savetty()
+    curses.raw()
+    curses.flushinp()
+
+    fd = sys.stdin.fileno()
+    pasted = bytearray()
+    next_progress = time.monotonic() + PASTE_PROGRESS_INTERVAL
+    try:
+        stdscr.addstr(h-2, 0, "Pasting... (ESC to cancel)")
+        stdscr.clrtoeol()
+        stdscr.refresh()
+
+        # Stop once the paste stream has been idle for 0.1s
+        while select.select([fd], [], [], 0.1)[0]:
+            chunk = os.read(fd, PASTE_CHUNK_SIZE)
+            if not chunk:
+                break
+            if chunk.find(b"\x1b") != -1:  # ESC
+                pasted.clear()
+                break
+            pasted += chunk
+
+            # Update progress at most every PASTE_PROGRESS_INTERVAL seconds
+            now = time.monotonic()
+            if now >= next_progress:
+                stdscr.addstr(h-2, 0, f"Pasting... {len(pasted)} bytes")
+                stdscr.clrtoeol()
+                stdscr.refresh()
+                next_progress = now + PASTE_PROGRESS_INTERVAL
+    finally:
+        curses.resetty()  # back to the terminal modes from before raw()
+
+    if pasted:
+        pasted_text = pasted.decode("utf-8", "replace")
+        state.redraw_from = state.cursor_y
+        state.cursor_y, state.cursor_x = insert_text(
+            state.buffer, state.cursor_y, state.cursor_x, pasted_text
+        )
+        state.dirty = True
+        state.status_message = f"Pasted {len(pasted_text)} chars!"
+    else:
+        state.status_message = "Paste canceled."
+
+def read_typed_run(stdscr, text):
+    """Extend typed text with the printable keys already queued.
+
+    Reading stops at the first other key, which is pushed back for the
+    main loop; fast typing or key repeat then costs one edit and redraw."""
+    stdscr.timeout(0)
+    while True:
+        try:
+            key = stdscr.get_wch()
+        except curses.error:
+            return text
+        if isinstance(key, str) and key.isprintable():
+            text += key
+        else:
+            if isinstance(key, str):
+                curses.unget_wch(key)
+            else:
+                curses.ungetch(key)
+            return text
+
+def insert_printable(state, text):
+    """Insert typed text at the cursor."""
+    edit_line(state.buffer, state.cursor_y).insert(state.cursor_x, text)
+    state.dirty_lines.add(state.cursor_y)
+    state.cursor_x += len(text)
+    state.dirty = True
+
+KEY_HANDLERS = {
+    24: handle_exit,  # Ctrl+X
+    19: handle_save,  # Ctrl+S
+    15: handle_open,  # Ctrl+O
+    curses.KEY_BACKSPACE: handle_backspace,
+    127: handle_backspace,
+    8: handle_backspace,
+    curses.KEY_ENTER: handle_enter,
+    10: handle_enter,
+    13: handle_enter,
+    curses.KEY_UP: handle_up,
+    curses.KEY_DOWN: handle_down,
+    curses.KEY_LEFT: handle_left,
+    curses.KEY_RIGHT: handle_right,
+    curses.KEY_RESIZE: handle_resize,
+    7: handle_help,  # Ctrl+G
+    12: handle_toggle_line_numbers,  # Ctrl+L
+    22: handle_paste,  # Ctrl+V
+}
+
+# Keys that keep the cursor line in its gap buffer
+GAP_KEYS = frozenset((
+    curses.KEY_LEFT, curses.KEY_RIGHT,
+    curses.KEY_BACKSPACE, 127, 8,
+    curses.KEY_ENTER, 10, 13,
+))
+
+# Keys whose handlers draw over the text area (prompts, help, the paste
+# indicator) or may have swallowed a KEY_RESIZE; they force a full repaint
+REPAINT_KEYS = frozenset((24, 19, 15, 22, 7, curses.KEY_RESIZE))
+
 def main(stdscr, filename=None):
     """Main editor loop."""
     curses.curs_set(1)
     stdscr.clear()
+    stdscr.keypad(True)
     init_colors()
     stdscr.timeout(100)
 
-    buffer = [""]
-    cursor_y = 0
-    cursor_x = 0
-    scroll_offset = 0
-    dirty = False
-    line_numbers = False
-    status_message = (
-        "Ctrl+X: Exit | Ctrl+S: Save | Ctrl+O: Open | "
-        "Ctrl+V: Paste | Ctrl+G: Help"
+    state = EditorState(
+        stdscr,
+        ChunkedLines([""]),
+        filename,
+        status_message=(
+            "Ctrl+X: Exit | Ctrl+S: Save | Ctrl+O: Open | "
+            "Ctrl+V: Paste | Ctrl+G: Help"
+        ),
     )
 
     if filename:
         try:
-            with open(filename, 'r') as f:
-                buffer = f.read().splitlines() or [""]
+            state.buffer = load_file(stdscr, filename)
         except FileNotFoundError:
-            status_message = "WARNING: File not found. Created new file."
+            state.status_message = "WARNING: File not found. Created new file."
         except Exception as e:
-            status_message = f"ERROR opening file: {str(e)}"
+            state.status_message = f"ERROR opening file: {str(e)}"
 
-    while True:
-        h, w = stdscr.getmaxyx()
-        stdscr.clear()
+    # The text area lives in a pad covering a band of lines around the
+    # viewport; pad_rows holds the text drawn on each pad row,
+    # or None where the row still has to be drawn. Setting repaint forces
+    # a full repaint; the pad itself is reused and only resized.
+    pad = None
+    repaint = True
+    pad_rows = None
+    pad_top = 0
+    drawn_prefix_width = None
+    # Only redraw after a state change; the clock ticks on its own
+    title_shown = None
+    status_shown = None
+    last_key_time = time.monotonic()
+
+    while state.running:
+        # The size is only re-queried on a full repaint (startup, resize,
+        # prompts), not on every frame
+        if repaint:
+            state.h, state.w = h, w = stdscr.getmaxyx()
         
         # Handle minimum window size
         if h < 3 or w < 10:
+            stdscr.erase()
             stdscr.addstr(0, 0, "Window too small!")
             stdscr.refresh()
+            repaint = True
+            state.need_render = True
+            stdscr.getch()  # wait for a resize
             continue
         
-        # Adjust scroll offset
-        visible_lines = h - 2
-        if cursor_y < scroll_offset:
-            scroll_offset = cursor_y
-        elif cursor_y >= scroll_offset + visible_lines:
-            scroll_offset = cursor_y - visible_lines + 1
+        buffer = state.buffer
+        cursor_y, cursor_x = state.cursor_y, state.cursor_x
+        if state.need_render:
+            # Adjust scroll offset
+            visible_lines = state.visible_lines = h - 2
+            if cursor_y < state.scroll_offset:
+                state.scroll_offset = cursor_y
+            elif cursor_y >= state.scroll_offset + visible_lines:
+                state.scroll_offset = cursor_y - visible_lines + 1
+            scroll_offset = state.scroll_offset
         
-        draw_title_bar(stdscr, filename, dirty, cursor_y, cursor_x)
-        draw_status_bar(stdscr, status_message)
+            if repaint:
+                band_height = visible_lines * PAD_SCREENS
+                if pad is None:
+                    pad = curses.newpad(band_height, w)
+                elif pad.getmaxyx() != (band_height, w):
+                    pad.resize(band_height, w)
+                repaint = False
+                pad_rows = None
+                title_shown = None
+                status_shown = None
+
+            # Re-center the band once the viewport scrolls out of it
+            if pad_rows is None or not (
+                pad_top <= scroll_offset <= pad_top + band_height - visible_lines
+            ):
+                pad_top = max(0, scroll_offset - visible_lines)
+                pad_rows = [None] * band_height
+
+            line_numbers = state.line_numbers
+            prefix_width = len(str(len(buffer))) + 1 if line_numbers else 0
+            prefix_fmt = f"%{prefix_width - 1}d " if line_numbers else None
+            line_area = max(0, w - 1 - prefix_width)
+            if prefix_width != drawn_prefix_width:
+                drawn_prefix_width = prefix_width
+                state.redraw_from = 0
+
+            # Forget the pad rows of lines edited since the last frame
+            if state.redraw_from is not None:
+                start = max(0, state.redraw_from - pad_top)
+                pad_rows[start:] = [None] * (band_height - start)
+                state.redraw_from = None
+            for line_num in state.dirty_lines:
+                if pad_top <= line_num < pad_top + band_height:
+                    pad_rows[line_num - pad_top] = None
+            state.dirty_lines.clear()
+
+            title_shown = update_title_bar(
+                stdscr, w, state.filename, state.dirty, cursor_y, cursor_x,
+                title_shown,
+            )
+            if state.status_message != status_shown:
+                draw_status_bar(stdscr, h, w, state.status_message)
+                status_shown = state.status_message
+
+            # Write the visible buffer lines missing from the pad
+            lines = buffer[scroll_offset:scroll_offset + visible_lines]
+            pad_clrtoeol, pad_addstr = pad.clrtoeol, pad.addstr
+            for i in range(visible_lines):
+                r = scroll_offset + i - pad_top
+                if pad_rows[r] is not None:
+                    continue
+                if i < len(lines):
+                    row = lines[i]
+                    if isinstance(row, GapLine):
+                        # Only decode what can be shown of the edited line
+                        row = row.head(line_area + ROW_SLACK)
+                    row = fit_row(row, line_area)
+                    # Curses cannot print embedded null characters, so replace
+                    # them; the membership test spares the copy when there are
+                    # none. fit_row() counted them as ^@, which is wider
+                    if "\x00" in row:
+                        row = row.replace("\x00", "\u2400")
+                    if not row.isascii():
+                        # Show bytes that were not valid UTF-8, which are
+                        # kept as surrogates, as U+FFFD
+                        row = row.encode("utf-8", "surrogateescape").decode(
+                            "utf-8", "replace")
+                    if line_numbers:
+                        row = prefix_fmt % (scroll_offset + i + 1) + row
+                else:
+                    row = ""
+                # One addstr per row; clrtoeol then clears what is left of
+                # the previous contents
+                try:
+                    pad_addstr(r, 0, row)
+                    pad_clrtoeol()
+                except curses.error:
+                    pass
+                pad_rows[r] = row
+                # If curses measured the row wider than fit_row() did, it
+                # wrapped over the next row, which then has to be redrawn
+                if pad.getyx()[0] != r and r + 1 < band_height:
+                    pad_rows[r + 1] = None
         
-        prefix_width = len(str(len(buffer))) + 1 if line_numbers else 0
-
-        # Display visible buffer lines
-        for i in range(visible_lines):
-            line_num = scroll_offset + i
-            if line_num < len(buffer):
-                line = buffer[line_num]
-                prefix = f"{line_num + 1:{prefix_width-1}d} " if line_numbers else ""
-                # Curses cannot print embedded null characters, so replace them
-                safe_line = line.replace("\x00", "\u2400")
-                stdscr.addstr(i + 1, 0, (prefix + safe_line)[: w - 1])
+            # Update cursor position; stdscr gets it too because getch()
+            # refreshes stdscr and would otherwise move the cursor away
+            cursor_col = prefix_width + min(cursor_x, w - 1 - prefix_width)
+            try:
+                stdscr.move(1 + cursor_y - scroll_offset, cursor_col)
+                pad.move(cursor_y - pad_top, cursor_col)
+            except curses.error:
+                pass
         
-        # Update cursor position
+            stdscr.noutrefresh()
+            pad.noutrefresh(scroll_offset - pad_top, 0, 1, 0, h - 2, w - 1)
+            curses.doupdate()
+            state.need_render = False
+        
+        # Poll quickly while keys are arriving; when idle, only wake up for
+        # the next clock second
+        if time.monotonic() - last_key_time < ACTIVE_PERIOD:
+            stdscr.timeout(ACTIVE_TIMEOUT_MS)
+        else:
+            stdscr.timeout(1000 - int(time.time() * 1000) % 1000)
         try:
-            stdscr.move(
-                1 + cursor_y - scroll_offset,
-                prefix_width + min(cursor_x, w - 1 - prefix_width),
-            )
+            key = stdscr.get_wch()
         except curses.error:
-            pass
-        
-        stdscr.refresh()
-        
-        key = stdscr.getch()
+            key = -1
+        # get_wch() returns text as str and special keys as int; control
+        # characters are handled by code like special keys
+        if isinstance(key, str) and not key.isprintable():
+            key = ord(key)
         if key == -1:
+            # Idle: only the clock (and a title left stale by cursor-only
+            # moves) can need updating
+            cursor_pos = stdscr.getyx()
+            shown = update_title_bar(
+                stdscr, w, state.filename, state.dirty, cursor_y, cursor_x,
+                title_shown,
+            )
+            if shown != title_shown:
+                title_shown = shown
+                stdscr.move(*cursor_pos)
+                stdscr.noutrefresh()
+                curses.doupdate()
             continue
+        last_key_time = time.monotonic()
+        state.need_render = True
+        state.cursor_only = False
         
-        # Handle controls
-        if key == 24:  # Ctrl+X
-            exit_now, filename, dirty, msg = confirm_exit(stdscr, filename, buffer, dirty)
-            if msg:
-                status_message = msg
-            if exit_now:
-                break
-            else:
-                continue
+        # Typing, backspace and Enter go through the gap buffer; any other
+        # key may need the current line as a plain string again
+        if not (isinstance(key, str) or key in GAP_KEYS):
+            flatten_line(buffer, cursor_y)
 
-        if key == 19:  # Ctrl+S (Save)
-            if filename:
-                try:
-                    save_file(filename, buffer)
-                    dirty = False
-                    status_message = f"Saved: {filename}"
-                except Exception as e:
-                    status_message = f"Save failed: {str(e)}"
-            else:
-                key = 15  # fall through to save as
+        if key in REPAINT_KEYS:
+            repaint = True
 
-        elif key == 15:  # Ctrl+O (Open)
-            new_filename = open_file_dialog(stdscr)
-            if new_filename:
-                try:
-                    with open(new_filename, "r") as f:
-                        buffer = f.read().splitlines() or [""]
-                    filename = new_filename
-                    dirty = False
-                    status_message = f"Opened: {filename}"
-                except FileNotFoundError:
-                    status_message = "File not found."
-                except Exception as e:
-                    status_message = f"Open failed: {str(e)}"
-        elif key in (curses.KEY_BACKSPACE, 127, 8):  # Backspace
-            if cursor_x > 0:
-                buffer[cursor_y] = buffer[cursor_y][:cursor_x-1] + buffer[cursor_y][cursor_x:]
-                cursor_x -= 1
-                dirty = True
-            elif cursor_y > 0:
-                prev_len = len(buffer[cursor_y-1])
-                buffer[cursor_y-1] += buffer.pop(cursor_y)
-                cursor_y -= 1
-                cursor_x = prev_len
-                dirty = True
-        elif key in (curses.KEY_ENTER, 10, 13):  # Enter
-            new_line = buffer[cursor_y][cursor_x:]
-            buffer[cursor_y] = buffer[cursor_y][:cursor_x]
-            buffer.insert(cursor_y + 1, new_line)
-            cursor_y += 1
-            cursor_x = 0
-            dirty = True
-        elif key == curses.KEY_UP and cursor_y > 0:
-            cursor_y -= 1
-            cursor_x = min(cursor_x, len(buffer[cursor_y]))
-        elif key == curses.KEY_DOWN and cursor_y < len(buffer) - 1:
-            cursor_y += 1
-            cursor_x = min(cursor_x, len(buffer[cursor_y]))
-        elif key == curses.KEY_LEFT and cursor_x > 0:
-            cursor_x -= 1
-        elif key == curses.KEY_RIGHT and cursor_x < len(buffer[cursor_y]):
-            cursor_x += 1
-        elif key == 7:  # Ctrl+G (Help)
-            show_help(stdscr)
-        elif key == 12:  # Ctrl+L (Toggle line numbers)
-            line_numbers = not line_numbers
-        elif key == 22:  # Ctrl+V (Paste)
-            # Improved paste implementation
-            curses.cbreak()
-            curses.raw()
-            stdscr.timeout(20)  # allow small delay for paste streaming
-            curses.flushinp()
-
-            pasted = []
-            last_input = time.time()
-            try:
-                stdscr.addstr(h-2, 0, "Pasting... (ESC to cancel)")
-                stdscr.clrtoeol()
-                stdscr.refresh()
+        # Handle controls
+        handler = KEY_HANDLERS.get(key)
+        if handler:
+            handler(state)
+        elif isinstance(key, str):  # Printable chars
+            insert_printable(state, read_typed_run(stdscr, key))
+        else:
+            state.need_render = False  # key had no effect
 
-                while True:
-                    k = stdscr.getch()
-                    if k == -1:
-                        if time.time() - last_input > 0.1:
-                            break
-                        else:
-                            continue
-                    last_input = time.time()
-                    if k == 27:  # ESC
-                        pasted = []
-                        break
-                    try:
-                        pasted.append(chr(k))
-                    except ValueError:
-                        pass
-
-                    # Update progress every 200 chars
-                    if len(pasted) % 200 == 0:
-                        stdscr.addstr(h-2, 0, f"Pasting... {len(pasted)} chars")
-                        stdscr.clrtoeol()
-                        stdscr.refresh()
-            finally:
-                stdscr.timeout(100)
-                curses.noraw()
-                curses.nocbreak()
-            
-            if pasted:
-                pasted_text = ''.join(pasted)
-                cursor_y, cursor_x = insert_text(buffer, cursor_y, cursor_x, pasted_text)
-                dirty = True
-                status_message = f"Pasted {len(pasted_text)} chars!"
-            else:
-                status_message = "Paste canceled."
-        elif 32 <= key <= 126:  # Printable chars
-            buffer[cursor_y] = buffer[cursor_y][:cursor_x] + chr(key) + buffer[cursor_y][cursor_x:]
-            cursor_x += 1
-            dirty = True
+        # Moves within the viewport only need the cursor repositioned; the
+        # title's line/column catches up on the next clock tick
+        if state.cursor_only:
+            state.need_render = False
+            try:
+                stdscr.move(
+                    1 + state.cursor_y - state.scroll_offset,
+                    prefix_width + min(state.cursor_x, w - 1 - prefix_width),
+                )
+            except curses.error:
+                pass
+            stdscr.refresh()
 
 if __name__ == "__main__":
     filename = sys.argv[1] if len(sys.argv) > 1 else None